@@ -5,6 +5,10 @@ This script queries the transformed mart tables and creates
 visualizations. In production, this step might be replaced by 
 Looker, Tableau, Metabase, or Hex — but the principle is the same:
 query clean, transformed data and present insights.
+
+Usage:
+  python3 03_visualize.py            # query the database, refresh the cache
+  python3 03_visualize.py --cached   # re-draw from the cached marts only
 """
 
 import duckdb
@@ -12,9 +16,49 @@ import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
 import pandas as pd
+import os
+import sys
 
 DB_PATH = "healthcare.duckdb"
-conn = duckdb.connect(DB_PATH, read_only=True)
+
+# The marts this script reads. Each normal run also saves them as Parquet
+# so that `--cached` runs (e.g. while tweaking chart styling) can skip the
+# database entirely and reload them in milliseconds.
+MART_TABLES = ["mart_state_hospital_summary", "mart_hospital_quality"]
+CACHE_DIR = "cache"
+
+if "--cached" in sys.argv:
+    # In-memory DuckDB with views over the cached files: the queries below
+    # run unchanged, but nothing touches healthcare.duckdb
+    conn = duckdb.connect()
+    conn.execute("CREATE SCHEMA analytics")
+    for table in MART_TABLES:
+        path = os.path.join(CACHE_DIR, f"{table}.parquet")
+        if not os.path.exists(path):
+            sys.exit(f"  ✗ {path} not found — run without --cached first")
+        conn.execute(f"CREATE VIEW analytics.{table} AS SELECT * FROM read_parquet('{path}')")
+    print(f"  ✓ Using cached marts from {CACHE_DIR}/")
+else:
+    conn = duckdb.connect(DB_PATH, read_only=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for table in MART_TABLES:
+        path = os.path.join(CACHE_DIR, f"{table}.parquet")
+        conn.execute(f"COPY (SELECT * FROM analytics.{table}) TO '{path}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+
+
+def query_df(sql):
+    """
+    Run a query and return the result as a pandas DataFrame.
+    
+    DuckDB hands results over as an Arrow table (no copying), and
+    ArrowDtype keeps the columns Arrow-backed in pandas — so text columns
+    stay as compact Arrow strings instead of one Python object per cell.
+    """
+    result = conn.execute(sql)
+    # Newer DuckDB renamed fetch_arrow_table() to to_arrow_table()
+    to_arrow = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+    return to_arrow().to_pandas(types_mapper=pd.ArrowDtype)
+
 
 # ── QUERY THE MART ──────────────────────────────────────────────────────
 print("=" * 60)
@@ -22,18 +66,24 @@ print("STEP 3: QUERYING TRANSFORMED DATA & CREATING VISUALIZATIONS")
 print("=" * 60)
 
 # Pull state-level summary from our dbt mart
-df_states = conn.execute("""
+df_states = query_df("""
     SELECT * FROM analytics.mart_state_hospital_summary
     ORDER BY total_hospitals DESC
-""").fetchdf()
-
-# Pull hospital-level quality data
-df_hospitals = conn.execute("""
-    SELECT * FROM analytics.mart_hospital_quality
-""").fetchdf()
+""")
+
+# Hospital-level numbers are aggregated INSIDE DuckDB, so only the small
+# result sets (a handful of rows each) come back to Python — never the
+# full hospital table
+hospital_count, avg_rating, access_risk = conn.execute("""
+    SELECT
+        COUNT(*)                                   AS total_hospitals,
+        AVG(overall_rating)                        AS avg_rating,
+        COUNT(*) FILTER (WHERE access_risk_flag)   AS access_risk_count
+    FROM analytics.mart_hospital_quality
+""").fetchone()
 
 print(f"\n  State summary: {len(df_states)} states")
-print(f"  Hospital detail: {len(df_hospitals):,} hospitals")
+print(f"  Hospital detail: {hospital_count:,} hospitals")
 
 # ── CHART 1: Hospitals by State ─────────────────────────────────────────
 fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -57,28 +107,37 @@ legend_elements = [
 axes[0, 0].legend(handles=legend_elements, loc='lower right', fontsize=8)
 
 # ── CHART 2: Rating Distribution ────────────────────────────────────────
-rating_dist = df_hospitals['overall_rating'].value_counts().sort_index()
-rated = rating_dist[rating_dist.index.notna()]
+rated = query_df("""
+    SELECT overall_rating, COUNT(*) AS hospitals
+    FROM analytics.mart_hospital_quality
+    WHERE overall_rating IS NOT NULL
+    GROUP BY overall_rating
+    ORDER BY overall_rating
+""")
 bar_colors = ['#F44336', '#FF9800', '#FFC107', '#8BC34A', '#4CAF50']
-axes[0, 1].bar(rated.index.astype(int), rated.values, color=bar_colors)
+axes[0, 1].bar(rated['overall_rating'].astype(int), rated['hospitals'], color=bar_colors)
 axes[0, 1].set_title('Hospital Rating Distribution', fontweight='bold')
 axes[0, 1].set_xlabel('CMS Star Rating')
 axes[0, 1].set_ylabel('Number of Hospitals')
 axes[0, 1].set_xticks([1, 2, 3, 4, 5])
 
 # ── CHART 3: Emergency Services by Quality ──────────────────────────────
-quality_groups = df_hospitals.groupby('quality_classification').agg(
-    total=('facility_id', 'count'),
-    with_emergency=('has_emergency_services', 'sum')
-).reset_index()
-quality_groups['pct_emergency'] = 100 * quality_groups['with_emergency'] / quality_groups['total']
-
-# Order logically
-order = ['High Quality', 'Average', 'Needs Improvement', 'Not Rated']
-quality_groups['sort_key'] = quality_groups['quality_classification'].map(
-    {v: i for i, v in enumerate(order)}
-)
-quality_groups = quality_groups.sort_values('sort_key')
+# Order logically: best → worst, unrated last
+quality_groups = query_df("""
+    SELECT
+        quality_classification,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE has_emergency_services) AS with_emergency,
+        100.0 * COUNT(*) FILTER (WHERE has_emergency_services) / COUNT(*) AS pct_emergency
+    FROM analytics.mart_hospital_quality
+    GROUP BY quality_classification
+    ORDER BY CASE quality_classification
+        WHEN 'High Quality'      THEN 0
+        WHEN 'Average'           THEN 1
+        WHEN 'Needs Improvement' THEN 2
+        WHEN 'Not Rated'         THEN 3
+    END
+""")
 
 q_colors = ['#4CAF50', '#FFC107', '#F44336', '#9E9E9E']
 axes[1, 0].bar(quality_groups['quality_classification'], 
@@ -89,14 +148,21 @@ axes[1, 0].set_ylim(0, 100)
 axes[1, 0].tick_params(axis='x', rotation=15)
 
 # ── CHART 4: Ownership Breakdown ────────────────────────────────────────
-ownership_dist = df_hospitals['ownership_category'].value_counts()
+ownership_dist = query_df("""
+    SELECT ownership_category, COUNT(*) AS hospitals
+    FROM analytics.mart_hospital_quality
+    GROUP BY ownership_category
+    ORDER BY hospitals DESC
+""")
 own_colors = ['#2196F3', '#FF9800', '#4CAF50', '#9E9E9E']
-axes[1, 1].pie(ownership_dist, labels=ownership_dist.index, autopct='%1.0f%%',
+axes[1, 1].pie(ownership_dist['hospitals'], labels=ownership_dist['ownership_category'], autopct='%1.0f%%',
                colors=own_colors, startangle=90)
 axes[1, 1].set_title('Hospital Ownership Breakdown', fontweight='bold')
 
-plt.tight_layout(rect=[0, 0, 1, 0.95])
-plt.savefig('dashboard.png', dpi=150, bbox_inches='tight')
+# tight_layout already fits everything inside the figure, so save it as-is
+# (bbox_inches='tight' would force an extra render pass just to measure)
+fig.tight_layout(rect=[0, 0, 1, 0.95])
+fig.savefig('dashboard.png', dpi=150)
 print(f"\n  ✓ Dashboard saved: dashboard.png")
 
 # ── PRINT KEY INSIGHTS ──────────────────────────────────────────────────
@@ -104,16 +170,24 @@ print(f"\n{'=' * 60}")
 print("KEY INSIGHTS FROM THE PIPELINE")
 print(f"{'=' * 60}")
 
-avg_rating = df_hospitals['overall_rating'].mean()
 print(f"\n  Overall avg hospital rating: {avg_rating:.2f} / 5.0")
 
-best_state = df_states.loc[df_states['avg_rating'].idxmax()]
-print(f"  Highest-rated state: {best_state['state']} (avg {best_state['avg_rating']:.2f})")
-
-worst_state = df_states.loc[df_states['avg_rating'].idxmin()]
-print(f"  Lowest-rated state:  {worst_state['state']} (avg {worst_state['avg_rating']:.2f})")
+# Let DuckDB pick the top/bottom state (a top-k sort) instead of scanning in pandas.
+# Ratings are rounded, so ties are common: break them by size, then name.
+best_state, best_avg = conn.execute("""
+    SELECT state, avg_rating FROM analytics.mart_state_hospital_summary
+    ORDER BY avg_rating DESC NULLS LAST, total_hospitals DESC, state
+    LIMIT 1
+""").fetchone()
+print(f"  Highest-rated state: {best_state} (avg {best_avg:.2f})")
+
+worst_state, worst_avg = conn.execute("""
+    SELECT state, avg_rating FROM analytics.mart_state_hospital_summary
+    ORDER BY avg_rating ASC NULLS LAST, total_hospitals DESC, state
+    LIMIT 1
+""").fetchone()
+print(f"  Lowest-rated state:  {worst_state} (avg {worst_avg:.2f})")
 
-access_risk = df_hospitals['access_risk_flag'].sum()
 print(f"  Hospitals flagged for access risk: {access_risk}")
 
 ehr_avg = df_states['pct_ehr_interop'].mean()